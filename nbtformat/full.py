@@ -10,13 +10,167 @@ NOTE: TAG_END is often used as a default or error value in this file
 
 
 # These imports are for the type annotations:
-from typing import BinaryIO, Any, Iterable, Mapping
+from typing import BinaryIO, Any, Callable, Iterable, Iterator, Mapping
 from gzip import GzipFile
 
+import array
+import concurrent.futures
+import gzip
+import io
+import mmap
+import os
 import struct
+import sys
 
 from .constants import *
 
+try:
+    ## Use the faster ISA-L gzip implementation for decompressing whole files, if it is installed
+    from isal import igzip as _gzip_decompressor
+except ImportError:
+    _gzip_decompressor = gzip
+
+
+# Precompiled big-endian structs for the numeric tag payloads (and the length and item type prefixes of the composite tags)
+_S_BYTE = struct.Struct('>b')
+_S_SHORT = struct.Struct('>h')
+_S_INT = struct.Struct('>i')
+_S_LONG = struct.Struct('>q')
+_S_FLOAT = struct.Struct('>f')
+_S_DOUBLE = struct.Struct('>d')
+
+# Precompiled structs for headers made of several fields: a list's item type and item count, and a named tag's type and name length
+_S_LIST_HEADER = struct.Struct('>bi')
+_S_NAMED_HEADER = struct.Struct('>bh')
+
+# Sizes of the structs above that are used for advancing buffer offsets (so they don't have to be looked up as attributes each time)
+_SIZE_SHORT = _S_SHORT.size
+_SIZE_INT = _S_INT.size
+_SIZE_LIST_HEADER = _S_LIST_HEADER.size
+_SIZE_NAMED_HEADER = _S_NAMED_HEADER.size
+
+# Buffer size used when writing to a file path
+_WRITE_BUFFER_SIZE = 128 * 1024
+
+# Cache of the decoded tag names, which are repeated very often (such as the keys of the compounds in a list), and a limit to how many names it keeps
+_NAME_CACHE: dict[bytes, str] = {}
+_NAME_CACHE_LIMIT = 4096
+
+# The binary form of a tag_end named tag (which is only the tag type byte)
+_END_BYTES = bytes((TAG_END,))
+
+# The first bytes of gzip-compressed data
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# Map a "numeric" tag type to its precompiled struct
+_NUMERIC_STRUCTS = {
+    TAG_BYTE: _S_BYTE,
+    TAG_SHORT: _S_SHORT,
+    TAG_INT: _S_INT,
+    TAG_LONG: _S_LONG,
+    TAG_FLOAT: _S_FLOAT,
+    TAG_DOUBLE: _S_DOUBLE,
+}
+
+# Sets of the integer and floating-point tag types, for fast membership checks
+_INTEGER_KINDS = frozenset((TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG))
+_FLOAT_KINDS = frozenset((TAG_FLOAT, TAG_DOUBLE))
+
+# Map an integer byte size to the (exclusive) magnitude limit of a signed integer of that size
+_INT_LIMITS = { n: 1 << (8 * n - 1) for n in (1, 2, 4, 8) }
+
+# Map a "numeric" tag type to its struct format character (which is also the 'array.array' type code for a list of them)
+_STRUCT_FORMATS = {
+    TAG_BYTE: 'b',
+    TAG_SHORT: 'h',
+    TAG_INT: 'i',
+    TAG_LONG: 'q',
+    TAG_FLOAT: 'f',
+    TAG_DOUBLE: 'd',
+}
+
+# Map an array tag type to the 'array.array' type code that stores its items
+_ARRAY_TYPECODES = {
+    TAG_BYTE_ARRAY: 'b',
+    TAG_INT_ARRAY: 'i',
+    TAG_LONG_ARRAY: 'q',
+}
+
+# Tag type names, and the item tag type of each array tag type (or TAG_END), indexed by tag type
+_KIND_NAMES = tuple(TAG_NAMES)
+_ARRAY_ITEM_KINDS = tuple([ TAG_ARRAY_SUBTYPES.get(k, TAG_END) for k in ALL_TAG_TYPES ])
+
+# Byte size of the payload of each numeric tag type (or 0 for the other tag types, which don't have a fixed size), indexed by tag type
+_FIXED_PAYLOAD_SIZES = tuple([ TAG_NUMERIC_BYTE_COUNT.get(k, 0) for k in ALL_TAG_TYPES ])
+
+# Smallest possible byte size of the payload of each tag type, indexed by tag type (for checking a list's item count against the data that is left before allocating its items)
+_MIN_PAYLOAD_SIZES = (
+    0,  # TAG_END
+    1,  # TAG_BYTE
+    2,  # TAG_SHORT
+    4,  # TAG_INT
+    8,  # TAG_LONG
+    4,  # TAG_FLOAT
+    8,  # TAG_DOUBLE
+    4,  # TAG_BYTE_ARRAY (the item count)
+    2,  # TAG_STRING (the length)
+    5,  # TAG_LIST (the item type and item count)
+    1,  # TAG_COMPOUND (the tag_end)
+    4,  # TAG_INT_ARRAY (the item count)
+    4,  # TAG_LONG_ARRAY (the item count)
+)
+
+# Static check to make sure no tag types were missed
+assert(len(_MIN_PAYLOAD_SIZES) == len(ALL_TAG_TYPES))
+
+# Map an array tag type to the byte size of its items
+_ARRAY_ITEM_SIZES = { k: TAG_NUMERIC_BYTE_COUNT[TAG_ARRAY_SUBTYPES[k]] for k in _ARRAY_TYPECODES }
+
+# Static check that the array type codes have the NBT item sizes on this platform
+assert(all(array.array(c).itemsize == TAG_NUMERIC_BYTE_COUNT[k] for k, c in _STRUCT_FORMATS.items()))
+
+# Shared (read-only) empty values for the 'val_list' and 'val_comp' of tags that aren't lists or compounds, so they don't each allocate an empty list and dict
+## (empty tuples, because unlike a mapping proxy they can be pickled and copied along with the tags)
+_NO_ITEMS = ()
+_NO_ENTRIES = ()
+
+# Whether array.array data must be byte-swapped to be big-endian
+_SWAP_ARRAYS = (sys.byteorder == 'little')
+
+
+# Errors from reading past the end of a buffer (which are raised as a 'ValueError' instead)
+_END_OF_DATA_ERRORS = (struct.error, IndexError)
+
+
+def _end_of_data_error(error: Exception) -> ValueError:
+    '''Make the 'ValueError' for a buffer that ends in the middle of a tag, from the error that reading past its end raised.'''
+    return ValueError(f"not enough data: the buffer ends in the middle of a tag ({error})")
+
+
+def _unread(file: BinaryIO | GzipFile, count: int) -> None:
+    '''Move a file's position back by 'count' bytes, to un-read data that was read past the end of a tag.'''
+    if count and file.seekable():
+        file.seek(-count, io.SEEK_CUR)
+
+
+def _array_typecode(tag_kind: int, list_item_kind: int) -> str | None:
+    '''Get the 'array.array' type code that stores the items of an array tag or a list of numbers, or None for any other tag.'''
+    if tag_kind == TAG_LIST:
+        return _STRUCT_FORMATS.get(list_item_kind)
+    return _ARRAY_TYPECODES.get(tag_kind)
+
+
+def _read_packed(typecode: str, item_count: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple[array.array, int]:
+    '''Copy 'item_count' big-endian numbers straight out of a buffer into an array.array, and return it and the offset past them.'''
+    values = array.array(typecode)
+    end = offset + max(item_count, 0) * values.itemsize
+    if end > len(buf):
+        raise ValueError(f"not enough data for {item_count} items of size {values.itemsize}")
+    values.frombytes(buf[offset:end])
+    if _SWAP_ARRAYS and values.itemsize > 1:
+        values.byteswap()
+    return values, end
+
 
 def nbt_int_from_bytes(b: bytes, length: int) -> int:
     '''
@@ -47,17 +201,17 @@ def int_sized(x: Any, size_bytes: int) -> int:
     '''Convert a value to int and make sure it can be represented by at most 'size_bytes' bytes.
     Raises a 'ValueError' otherwise.'''
     result = int(x)
-    if (result.bit_length() / 8.0) > size_bytes:
+    limit = _INT_LIMITS.get(size_bytes) or (1 << (8 * size_bytes - 1))
+    if not (-limit <= result < limit):
         raise ValueError(f"magnitude of integer value '{result}' is too large to fit within a {size_bytes}-byte representation")
     return result
 
 
 def tag_kind_to_str(tag_type: int) -> str:
     '''Get the string name for a tag type'''
-    try:
-        return TAG_NAMES[tag_type]
-    except IndexError:
-        raise ValueError(f"int value of {tag_type} does not represent a type of NBT tag")
+    if 0 <= tag_type < len(_KIND_NAMES):
+        return _KIND_NAMES[tag_type]
+    raise ValueError(f"int value of {tag_type} does not represent a type of NBT tag")
 
 
 def tag_array_type_to_item_type(tag_type: int) -> int:
@@ -65,7 +219,460 @@ def tag_array_type_to_item_type(tag_type: int) -> int:
     Get what the sub-item tag type for the given array-like tag type is.
     The default/error value returned is TAG_END.
     '''
-    return TAG_ARRAY_SUBTYPES.get(tag_type, TAG_END)
+    if 0 <= tag_type < len(_ARRAY_ITEM_KINDS):
+        return _ARRAY_ITEM_KINDS[tag_type]
+    return TAG_END
+
+
+def read_nbt(path: str | os.PathLike, lazy: bool = False) -> 'NamedTag':
+    '''
+    Read a named tag from an NBT file path, which may be gzip-compressed or uncompressed.
+    A compressed file is decompressed into memory all at once (using the 'isal' package if it is installed) and then parsed with 'NamedTag.read_from_bytes'.
+    If 'lazy' is True, a compound tag is read as a 'TagCompoundLazy'.
+    '''
+    with open(path, "rb") as file:
+        is_gzip = (file.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC)
+    if not is_gzip:
+        return NamedTag.read_from_file(path, lazy=lazy)
+    with memoryview(read_nbt_data(path)) as buf:
+        return NamedTag.read_from_bytes(buf, lazy=lazy)[0]
+
+
+def read_nbt_data(path: str | os.PathLike) -> bytes:
+    '''
+    Read all of the data from an NBT file path, decompressing it all at once if it is gzip-compressed (using the 'isal' package if it is installed).
+    The result can be parsed with 'NamedTag.read_from_bytes' or printed with 'nbtformat.printing.print_tag_from_bytes'.
+    '''
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[:len(_GZIP_MAGIC)] == _GZIP_MAGIC:
+        data = _gzip_decompressor.decompress(data)
+    return data
+
+
+def read_nbt_files(paths: Iterable[str | os.PathLike], max_workers: int | None = None) -> list['NamedTag']:
+    '''
+    Read the named tags from many NBT file paths (each one with 'read_nbt'), in parallel with a pool of processes.
+    The results are in the same order as the paths. If 'max_workers' is None, one process is used for each CPU.
+    NOTE: this is only faster when there is a lot of data to parse, because the tags have to be sent back from the worker processes.
+    '''
+    paths = list(paths)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1 or len(paths) <= 1:
+        return [ read_nbt(path) for path in paths ]
+    ## Send the paths to the workers in batches, so that small files don't each cost a round trip
+    chunksize = max(1, len(paths) // (max_workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_nbt, paths, chunksize=chunksize))
+
+
+def find_tag(buf: bytes | bytearray | memoryview, path: Iterable[str], offset: int = 0) -> 'TagPayload | None':
+    '''
+    Find and decode only the tag at the given 'path' of names, within the compound payload of the named tag at 'offset' in a bytes-like buffer.
+    Every other tag is skipped over without being decoded. For example, 'find_tag(data, ["Data", "LevelName"])'.
+    Returns None if there is no tag at the path.
+    '''
+    if isinstance(path, str):
+        raise TypeError(f"'path' must be an iterable of names, not a single string (use [{path!r}] for a path of one name)")
+    ## Locate the root named tag's payload
+    if offset >= len(buf) or buf[offset] == TAG_END:
+        return None
+    try:
+        kind, name_len = _S_NAMED_HEADER.unpack_from(buf, offset)
+        if not (0 < kind < len(_PAYLOAD_READERS)):
+            raise ValueError(f"encountered invalid tag type byte value: {kind} while reading buffer")
+        if name_len < 0:
+            raise ValueError(f"not enough data for a tag name of length {name_len}")
+        offset += _SIZE_NAMED_HEADER + name_len
+        for name in path:
+            if kind != TAG_COMPOUND:
+                return None
+            ## Scan the compound's named sub-tags, comparing names without decoding them
+            target = name.encode('utf-8')
+            while True:
+                if offset >= len(buf) or buf[offset] == TAG_END:
+                    return None
+                kind, name_len = _S_NAMED_HEADER.unpack_from(buf, offset)
+                if not (0 < kind < len(_PAYLOAD_READERS)):
+                    raise ValueError(f"encountered invalid tag type byte value: {kind} while reading buffer")
+                if name_len < 0:
+                    raise ValueError(f"not enough data for a tag name of length {name_len}")
+                name_start = offset + _SIZE_NAMED_HEADER
+                offset = name_start + name_len
+                if buf[name_start:offset] == target:
+                    break
+                offset = _skip_payload(kind, buf, offset)
+        return _PAYLOAD_READERS[kind](kind, buf, offset)[0]
+    except _END_OF_DATA_ERRORS as e:
+        raise _end_of_data_error(e) from e
+
+
+def _read_name(buf: bytes | bytearray | memoryview, start: int, end: int) -> str:
+    '''Decode a tag name from a buffer, sharing a single interned string for all of the tags with the same name.'''
+    if not (start <= end <= len(buf)):
+        raise ValueError(f"not enough data for a tag name of length {end - start}")
+    data = bytes(buf[start:end])
+    name = _NAME_CACHE.get(data)
+    if name is None:
+        name = sys.intern(str(data, 'utf-8'))
+        if len(_NAME_CACHE) < _NAME_CACHE_LIMIT:
+            _NAME_CACHE[data] = name
+    return name
+
+
+def _read_end(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple['TagPayload', int]:
+    '''Read a tag_end payload, which has no bytes.'''
+    return _TAG_END, offset
+
+
+def _read_byte(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple['TagPayload', int]:
+    '''Read a byte payload (by indexing the buffer directly, which is faster than unpacking a struct for one byte).'''
+    value = buf[offset]
+    return TagPayload._unchecked(tag_kind, value - 256 if value >= 128 else value), offset + 1
+
+
+def _read_numeric(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple['TagPayload', int]:
+    '''Read an integer or float payload.'''
+    s = _NUMERIC_STRUCTS[tag_kind]
+    return TagPayload._unchecked(tag_kind, s.unpack_from(buf, offset)[0]), offset + s.size
+
+
+def _read_string(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple['TagPayload', int]:
+    '''Read a length-prefixed string payload (length prefix is a tag_short).'''
+    str_len = _S_SHORT.unpack_from(buf, offset)[0]
+    offset += _SIZE_SHORT
+    end = offset + str_len
+    if not (offset <= end <= len(buf)):
+        raise ValueError(f"not enough data for a string of length {str_len}")
+    return TagPayload._unchecked(tag_kind, str(buf[offset:end], 'utf-8')), end
+
+
+def _read_array(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple['TagPayload', int]:
+    '''Read a length-prefixed array payload (the items are copied straight into an array.array).'''
+    item_count = _S_INT.unpack_from(buf, offset)[0]
+    values, offset = _read_packed(_ARRAY_TYPECODES[tag_kind], item_count, buf, offset + _SIZE_INT)
+    return TagPayload._unchecked(tag_kind, values), offset
+
+
+def _open_nested(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple['TagPayload', list | None, int]:
+    '''
+    Start reading a compound or list payload. Returns the (unfinished) payload, a stack frame for the items that still need to be read (or None), and the new offset.
+    A list's items are all read right away, unless they are compounds or lists themselves.
+    '''
+    if tag_kind == TAG_COMPOUND:
+        compound: dict[str, TagPayload] = dict()
+        return TagPayload._unchecked(tag_kind, compound), [TAG_COMPOUND, compound], offset
+    item_type, item_count = _S_LIST_HEADER.unpack_from(buf, offset)
+    offset += _SIZE_LIST_HEADER
+    if item_type in _STRUCT_FORMATS:
+        ## Numeric items are all read at once into an array.array
+        values, offset = _read_packed(_STRUCT_FORMATS[item_type], item_count, buf, offset)
+        return TagPayload._unchecked(tag_kind, values, list_item_kind=item_type), None, offset
+    if not (0 <= item_type < len(_PAYLOAD_READERS)):
+        raise ValueError(f"cannot read a list with invalid item tag kind: {item_type}")
+    ## Check the item count against the data that is left before allocating the items, so that a corrupt count can't allocate a huge list
+    if item_count * _MIN_PAYLOAD_SIZES[item_type] > len(buf) - offset:
+        raise ValueError(f"not enough data for {item_count} items of a list of {tag_kind_to_str(item_type)}")
+    items = [None] * max(item_count, 0)
+    payload = TagPayload._unchecked(tag_kind, items, list_item_kind=item_type)
+    if item_type == TAG_COMPOUND or item_type == TAG_LIST:
+        return payload, [TAG_LIST, items, item_type, 0], offset
+    reader = _PAYLOAD_READERS[item_type]
+    for i in range(item_count):
+        items[i], offset = reader(item_type, buf, offset)
+    return payload, None, offset
+
+
+def _read_nested(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple['TagPayload', int]:
+    '''
+    Read a compound or list payload, along with all of the compounds and lists nested within it.
+    This uses an explicit stack instead of recursion, so deeply nested data does not hit Python's recursion limit.
+    A compound ends at a tag_end tag (or the end of the buffer).
+    '''
+    payload, frame, offset = _open_nested(tag_kind, buf, offset)
+    ## Each stack frame is either [TAG_COMPOUND, dict] or [TAG_LIST, items, item kind, index of the next item]
+    stack = [frame] if frame is not None else []
+    readers = _PAYLOAD_READERS
+    while stack:
+        frame = stack[-1]
+        if frame[0] == TAG_COMPOUND:
+            ## Read the next named tag of a compound
+            if offset >= len(buf):
+                stack.pop()
+                continue
+            kind = buf[offset]
+            if kind == TAG_END:
+                offset += 1
+                stack.pop()
+                continue
+            if kind >= len(readers):
+                raise ValueError(f"encountered invalid tag type byte value: {kind} while reading buffer")
+            name_len = _S_NAMED_HEADER.unpack_from(buf, offset)[1]
+            offset += _SIZE_NAMED_HEADER
+            name = _read_name(buf, offset, offset + name_len)
+            offset += name_len
+            if kind == TAG_COMPOUND or kind == TAG_LIST:
+                frame[1][name], child_frame, offset = _open_nested(kind, buf, offset)
+                if child_frame is not None:
+                    stack.append(child_frame)
+            else:
+                frame[1][name], offset = readers[kind](kind, buf, offset)
+        else:
+            ## Read the next item of a list of compounds or lists
+            items, item_type, i = frame[1], frame[2], frame[3]
+            if i >= len(items):
+                stack.pop()
+                continue
+            frame[3] = i + 1
+            items[i], child_frame, offset = _open_nested(item_type, buf, offset)
+            if child_frame is not None:
+                stack.append(child_frame)
+    return payload, offset
+
+
+def _skip_payload(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> int:
+    '''Get the offset just past the payload of the given tag type in a buffer, without decoding it.'''
+    buf_len = len(buf)
+    if tag_kind != TAG_COMPOUND and tag_kind != TAG_LIST:
+        offset = _skip_flat_payload(tag_kind, buf, offset)
+    else:
+        ## Each stack frame is either None (for a compound) or [item kind, number of items left] (for a list of compounds or lists)
+        stack = []
+        kind = tag_kind
+        fixed_sizes = _FIXED_PAYLOAD_SIZES
+        while True:
+            ## Start skipping a compound or list
+            if kind == TAG_COMPOUND:
+                stack.append(None)
+            else:
+                item_type, item_count = _S_LIST_HEADER.unpack_from(buf, offset)
+                offset += _SIZE_LIST_HEADER
+                if item_type == TAG_COMPOUND or item_type == TAG_LIST:
+                    stack.append([item_type, item_count])
+                elif item_type in _NUMERIC_STRUCTS:
+                    offset += max(item_count, 0) * TAG_NUMERIC_BYTE_COUNT[item_type]
+                elif item_type != TAG_END:
+                    ## (tag_end items don't have any bytes to skip)
+                    for _ in range(item_count):
+                        offset = _skip_flat_payload(item_type, buf, offset)
+
+            ## Find the next compound or list to start skipping (skipping any other tags along the way), finishing any compounds and lists that have ended
+            while stack:
+                frame = stack[-1]
+                if frame is None:
+                    kind = TAG_END
+                    while offset < buf_len:
+                        kind = buf[offset]
+                        offset += 1
+                        if kind == TAG_END:
+                            break
+                        name_len = _S_SHORT.unpack_from(buf, offset)[0]
+                        if name_len < 0:
+                            raise ValueError(f"not enough data for a tag name of length {name_len}")
+                        offset += _SIZE_SHORT + name_len
+                        if kind < len(fixed_sizes) and fixed_sizes[kind]:
+                            offset += fixed_sizes[kind]
+                        elif kind == TAG_COMPOUND or kind == TAG_LIST:
+                            break
+                        else:
+                            offset = _skip_flat_payload(kind, buf, offset)
+                        kind = TAG_END
+                    if kind == TAG_END:
+                        stack.pop()
+                        continue
+                    break
+                if frame[1] <= 0:
+                    stack.pop()
+                    continue
+                if offset >= buf_len:
+                    raise ValueError(f"not enough data for the {frame[1]} remaining items of a list")
+                frame[1] -= 1
+                kind = frame[0]
+                break
+            else:
+                break
+    if offset > buf_len:
+        raise ValueError(f"not enough data: the buffer ends in the middle of a {tag_kind_to_str(tag_kind)} payload")
+    return offset
+
+
+def _skip_flat_payload(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> int:
+    '''Get the offset just past the payload of a tag type that is not a compound or list in a buffer, without decoding it.'''
+    if tag_kind == TAG_END:
+        return offset
+    elif tag_kind in _NUMERIC_STRUCTS:
+        return offset + TAG_NUMERIC_BYTE_COUNT[tag_kind]
+    elif tag_kind == TAG_STRING:
+        str_len = _S_SHORT.unpack_from(buf, offset)[0]
+        if str_len < 0:
+            raise ValueError(f"not enough data for a string of length {str_len}")
+        return offset + _SIZE_SHORT + str_len
+    elif tag_kind in _ARRAY_TYPECODES:
+        item_count = _S_INT.unpack_from(buf, offset)[0]
+        return offset + _SIZE_INT + max(item_count, 0) * _ARRAY_ITEM_SIZES[tag_kind]
+    else:
+        raise ValueError(f"cannot skip a tag with invalid tag kind: {tag_kind}")
+
+
+def _read_lazy_compound(tag_kind: int, buf: bytes | bytearray | memoryview, offset: int) -> tuple['TagCompoundLazy', int]:
+    '''Read a compound payload as a 'TagCompoundLazy', which only locates its named sub-tags instead of decoding them.'''
+    start = offset
+    entries: dict[str, tuple[int, int]] = dict()
+    while offset < len(buf):
+        kind = buf[offset]
+        if kind == TAG_END:
+            break
+        if kind >= len(_PAYLOAD_READERS):
+            raise ValueError(f"encountered invalid tag type byte value: {kind} while reading buffer")
+        name_len = _S_SHORT.unpack_from(buf, offset + 1)[0]
+        name_start = offset + 1 + _SIZE_SHORT
+        payload_start = name_start + name_len
+        entries[_read_name(buf, name_start, payload_start)] = (kind, payload_start - start)
+        offset = _skip_payload(kind, buf, payload_start)
+    compound = TagCompoundLazy(bytes(buf[start:offset]), entries)
+    ## Skip the tag_end byte (unless the buffer ended without one)
+    return compound, min(offset + 1, len(buf))
+
+
+def _write_named_tag(write: Callable[[bytes], Any], name: str, payload: 'TagPayload') -> None:
+    '''Write a name and payload as a named tag with the given 'write' function (without needing a 'NamedTag' object).'''
+    kind = payload._tag_kind
+    if kind == TAG_END:
+        ## Special case: tag_end tags only have the tag type byte, and don't have a name or payload
+        write(_END_BYTES)
+        return
+    ## Write the tag type byte and name length together, and then the name and payload
+    name_data = name.encode('utf-8')
+    write(_S_NAMED_HEADER.pack(kind, len(name_data)))
+    write(name_data)
+    payload._write(write)
+
+
+def _write_end(payload: 'TagPayload', write: Callable[[bytes], Any]) -> None:
+    '''Write a tag_end payload, which has no bytes.'''
+    return
+
+
+def _write_integer(payload: 'TagPayload', write: Callable[[bytes], Any]) -> None:
+    '''Write an integer payload.'''
+    write(_NUMERIC_STRUCTS[payload._tag_kind].pack(payload.val_int))
+
+
+def _write_float(payload: 'TagPayload', write: Callable[[bytes], Any]) -> None:
+    '''Write a float or double payload.'''
+    write(_NUMERIC_STRUCTS[payload._tag_kind].pack(payload.val_float))
+
+
+def _write_string(payload: 'TagPayload', write: Callable[[bytes], Any]) -> None:
+    '''Write a string payload, which is length-encoded with a short value that is the byte count of the UTF-8 data.'''
+    data = payload.val_str.encode('utf-8')
+    write(_S_SHORT.pack(len(data)))
+    write(data)
+
+
+def _write_packed(payload: 'TagPayload', write: Callable[[bytes], Any]) -> None:
+    '''
+    Write an array payload or a list of numbers, which is an element count (lists have an element type byte first) and then the elements.
+    The elements are byte-swapped all at once if needed.
+    '''
+    values = payload.val_array
+    if payload._tag_kind == TAG_LIST:
+        write(_S_LIST_HEADER.pack(payload._list_item_kind, len(values)))
+    else:
+        write(_S_INT.pack(len(values)))
+    if _SWAP_ARRAYS and values.itemsize > 1:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    write(values.tobytes())
+
+
+def _write_list(payload: 'TagPayload', write: Callable[[bytes], Any]) -> None:
+    '''Write a list payload, which is an element type byte and an element count, and then the elements.'''
+    if payload.val_array is not None:
+        _write_packed(payload, write)
+        return
+    _write_nested(payload, write)
+
+
+def _start_nested_write(payload: 'TagPayload', write: Callable[[bytes], Any]) -> tuple[Iterator, bool]:
+    '''Write the header of a compound or (non-numeric) list payload, and return a stack frame for the items that still need to be written.'''
+    if payload._tag_kind == TAG_COMPOUND:
+        return iter(payload.val_comp.items()), True
+    write(_S_LIST_HEADER.pack(payload._list_item_kind, len(payload.val_list)))
+    return iter(payload.val_list), False
+
+
+def _write_nested(payload: 'TagPayload', write: Callable[[bytes], Any]) -> None:
+    '''Write a compound payload (its named sub-tags and then a tag_end, which is not kept in the dictionary) or a list payload, along with everything nested within it.'''
+    ## Each stack frame is an iterator over the items that still need to be written, and whether the items are named compound entries
+    stack = [_start_nested_write(payload, write)]
+    while stack:
+        items, is_compound = stack[-1]
+        for item in items:
+            if is_compound:
+                name, tag = item
+                kind = tag._tag_kind
+                if kind == TAG_END:
+                    ## A compound cannot contain a tag_end (writing one would end the compound early), so skip it
+                    continue
+                name_data = name.encode('utf-8')
+                write(_S_NAMED_HEADER.pack(kind, len(name_data)))
+                write(name_data)
+            else:
+                tag = item
+                kind = tag._tag_kind
+            if (kind == TAG_COMPOUND and not isinstance(tag, TagCompoundLazy)) or (kind == TAG_LIST and tag.val_array is None):
+                ## Write the nested tag's items before continuing with the rest of this frame's items
+                stack.append(_start_nested_write(tag, write))
+                break
+            tag._write(write)
+        else:
+            stack.pop()
+            if is_compound:
+                write(_END_BYTES)
+
+
+# Functions that read a payload from a buffer, indexed by tag type
+_PAYLOAD_READERS = (
+    _read_end,      # TAG_END
+    _read_byte,     # TAG_BYTE
+    _read_numeric,  # TAG_SHORT
+    _read_numeric,  # TAG_INT
+    _read_numeric,  # TAG_LONG
+    _read_numeric,  # TAG_FLOAT
+    _read_numeric,  # TAG_DOUBLE
+    _read_array,    # TAG_BYTE_ARRAY
+    _read_string,   # TAG_STRING
+    _read_nested,   # TAG_LIST
+    _read_nested,   # TAG_COMPOUND
+    _read_array,    # TAG_INT_ARRAY
+    _read_array,    # TAG_LONG_ARRAY
+)
+
+# Static check to make sure no tag types were missed
+assert(len(_PAYLOAD_READERS) == len(ALL_TAG_TYPES))
+
+
+# Functions that write a payload with a 'write' function, indexed by tag type
+_PAYLOAD_WRITERS = (
+    _write_end,      # TAG_END
+    _write_integer,  # TAG_BYTE
+    _write_integer,  # TAG_SHORT
+    _write_integer,  # TAG_INT
+    _write_integer,  # TAG_LONG
+    _write_float,    # TAG_FLOAT
+    _write_float,    # TAG_DOUBLE
+    _write_packed,   # TAG_BYTE_ARRAY
+    _write_string,   # TAG_STRING
+    _write_list,     # TAG_LIST
+    _write_nested,   # TAG_COMPOUND
+    _write_packed,   # TAG_INT_ARRAY
+    _write_packed,   # TAG_LONG_ARRAY
+)
+
+# Static check to make sure no tag types were missed
+assert(len(_PAYLOAD_WRITERS) == len(ALL_TAG_TYPES))
 
 
 class TagPayload:
@@ -74,48 +681,68 @@ class TagPayload:
     Typically, you do not want to instantiate this directly, but rather use the defined subclasses TagInt, TagString, etc.
     '''
 
+    __slots__ = ('_tag_kind', '_list_item_kind', 'val_int', 'val_float', 'val_str', 'val_list', 'val_comp', 'val_array')
+
     @classmethod
     def read_from_file(cls, tag_kind: int, file: BinaryIO | GzipFile) -> 'TagPayload':
-        '''Read the tag payload of the given tag type from a binary file.'''
-        k = tag_kind
-        if k == TAG_END:
-            ## Read no bytes
-            return TagPayload(k)
-        elif k in (TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG):
-            ## Integer types
-            size = numeric_tag_size(k)
-            return TagPayload(k, nbt_int_from_bytes(file.read(size), size))
-        elif k == TAG_FLOAT: 
-            return TagPayload(k, struct.unpack('>f', file.read(numeric_tag_size(TAG_FLOAT)))[0])
-        elif k == TAG_DOUBLE:
-            return TagPayload(k, struct.unpack('>d', file.read(numeric_tag_size(TAG_DOUBLE)))[0])
-        elif k == TAG_STRING:
-            ## Read length-prefixed string (length prefix is a tag_short)
-            str_len = TagPayload.read_from_file(TAG_SHORT, file).val_int
-            return TagPayload(k, file.read(str_len).decode())
-        elif k == TAG_LIST:
-            ## Read type-prefixed, length-prefixed list
-            item_type = TagPayload.read_from_file(TAG_BYTE, file).val_int
-            item_count = TagPayload.read_from_file(TAG_INT, file).val_int
-            return TagPayload(k, [ TagPayload.read_from_file(item_type, file) for _ in range(item_count) ], list_item_kind=item_type)
-        elif k in (TAG_BYTE_ARRAY, TAG_INT_ARRAY, TAG_LONG_ARRAY):
-            ## Read length-prefixed array
-            item_type = tag_array_type_to_item_type(k)
-            item_count = TagPayload.read_from_file(TAG_INT, file).val_int
-            return TagPayload(k, [ TagPayload.read_from_file(item_type, file) for _ in range(item_count) ])
-        elif k == TAG_COMPOUND:
-            ## Read tags for a tag compound until a tag_end tag is encountered (or EOF)
-            compound: dict[str, TagPayload] = dict()
-            while (named_tag := NamedTag.read_from_file(file)).payload.tag_kind != TAG_END:
-                compound[named_tag.name] = named_tag.payload
-            return TagPayload(k, compound)
-        else:
+        '''
+        Read the tag payload of the given tag type from a binary file.
+        NOTE: the rest of the file is read into memory and parsed with 'read_from_bytes'. If the file is seekable, it is left positioned just past the tag payload.
+        '''
+        data = file.read()
+        payload, offset = cls.read_from_bytes(tag_kind, data)
+        _unread(file, len(data) - offset)
+        return payload
+
+
+    @classmethod
+    def read_from_bytes(cls, tag_kind: int, buf: bytes | bytearray | memoryview, offset: int = 0) -> tuple['TagPayload', int]:
+        '''
+        Read the tag payload of the given tag type from a bytes-like buffer, starting at 'offset'.
+        Returns the tag payload and the offset just past its data.
+        '''
+        if not (0 <= tag_kind < len(_PAYLOAD_READERS)):
             raise ValueError(f"cannot read a tag with invalid tag kind: {tag_kind}")
+        try:
+            return _PAYLOAD_READERS[tag_kind](tag_kind, buf, offset)
+        except _END_OF_DATA_ERRORS as e:
+            raise _end_of_data_error(e) from e
+
+
+    @classmethod
+    def _unchecked(cls, tag_kind: int, tag_value: Any = None, list_item_kind: int = TAG_END) -> 'TagPayload':
+        '''
+        Create a TagPayload without any of the type and range checks that '__init__' does.
+        This is for the payload readers, which only produce correctly-typed values.
+        '''
+        self = cls.__new__(cls)
+        self._tag_kind = tag_kind
+        self._list_item_kind = list_item_kind
+        self.val_int = 0
+        self.val_float = 0.0
+        self.val_str = ''
+        self.val_list = _NO_ITEMS
+        self.val_comp = _NO_ENTRIES
+        self.val_array = None
+        if tag_value is not None:
+            if tag_kind in _INTEGER_KINDS:
+                self.val_int = tag_value
+            elif tag_kind in _FLOAT_KINDS:
+                self.val_float = tag_value
+            elif tag_kind == TAG_STRING:
+                self.val_str = tag_value
+            elif tag_kind in _ARRAY_TYPECODES or isinstance(tag_value, array.array):
+                self.val_array = tag_value
+            elif tag_kind == TAG_LIST:
+                self.val_list = tag_value
+            elif tag_kind == TAG_COMPOUND:
+                self.val_comp = tag_value
+        return self
 
 
     def __init__(self, 
                  tag_kind: int = TAG_END, 
-                 tag_value: int | float | str | Iterable['TagPayload'] | Mapping[str, 'TagPayload'] | None = None,
+                 tag_value: int | float | str | Iterable['TagPayload'] | Iterable[int] | Mapping[str, 'TagPayload'] | None = None,
                  list_item_kind: int = TAG_END) -> None:
         if not tag_kind in ALL_TAG_TYPES:
             raise ValueError(f"Attempted to initialize 'TagPayload' with invalid 'tag_kind': {tag_kind}")
@@ -129,30 +756,66 @@ class TagPayload:
         self.val_int: int = 0
         self.val_float: float = 0.0
         self.val_str: str = ''
-        self.val_list: list[TagPayload] = []
-        self.val_comp: dict[str, TagPayload] = {}
+        typecode = _array_typecode(tag_kind, list_item_kind)
+        ## (a list of numbers gets the read-only empty 'val_list', so that adding tags to it raises an error instead of being ignored)
+        self.val_list: list[TagPayload] = [] if (tag_kind == TAG_LIST and typecode is None) else _NO_ITEMS
+        self.val_comp: dict[str, TagPayload] = {} if tag_kind == TAG_COMPOUND else _NO_ENTRIES
+        self.val_array: array.array | None = None
+        if typecode is not None:
+            ## Arrays and lists of numbers keep their items packed in an array.array instead of as TagPayload's
+            self.val_array = array.array(typecode)
 
         ## Assign the correct value (if given None, the default value will be kept, which also covers the case with a tag_end tag).
         if tag_value is not None:
-            if self.tag_kind in (TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG) and isinstance(tag_value, int):
+            if self.tag_kind in _INTEGER_KINDS and isinstance(tag_value, int):
                 self.val_int = int_sized(tag_value, numeric_tag_size(self._tag_kind))
-            elif self.tag_kind in (TAG_FLOAT, TAG_DOUBLE) and isinstance(tag_value, float):
+            elif self.tag_kind in _FLOAT_KINDS and isinstance(tag_value, float):
                 self.val_float = tag_value
             elif self.tag_kind == TAG_STRING and isinstance(tag_value, str):
-                self.val_str = str(tag_value)
-            elif self.tag_kind in (TAG_LIST, TAG_BYTE_ARRAY, TAG_INT_ARRAY, TAG_LONG_ARRAY) and isinstance(tag_value, list):
+                self.val_str = tag_value
+            elif typecode is not None and isinstance(tag_value, Iterable):
+                if isinstance(tag_value, array.array) and tag_value.typecode == typecode:
+                    ## Keep the given array instead of copying it
+                    self.val_array = tag_value
+                elif typecode == 'b' and isinstance(tag_value, (bytes, bytearray)):
+                    ## Raw bytes for a byte array are copied as-is
+                    self.val_array = array.array(typecode, tag_value)
+                else:
+                    ## Items may be plain numbers or numeric TagPayload's
+                    is_float = self.item_kind in _FLOAT_KINDS
+                    values = []
+                    for i, item in enumerate(tag_value):
+                        if isinstance(item, TagPayload):
+                            if item.tag_kind != self.item_kind:
+                                item_kind_name = tag_kind_to_str(self.item_kind)
+                                raise ValueError(f"item at index {i} is a {item.kind_name} instead of the expected {item_kind_name}")
+                            item = item.val_float if is_float else item.val_int
+                        values.append(item)
+                    self.val_array = array.array(typecode, values)
+            elif self.tag_kind == TAG_LIST and isinstance(tag_value, Iterable) and not isinstance(tag_value, (str, dict)):
+                if not isinstance(tag_value, list):
+                    ## Other iterables (such as tuples and generators) are collected into a list
+                    tag_value = list(tag_value)
                 for i, item in enumerate(tag_value):
+                    if not isinstance(item, TagPayload):
+                        raise TypeError(f"item at index {i} is of type {type(item)} instead of 'TagPayload'")
                     if item.tag_kind != self.item_kind:
                         item_kind_name = tag_kind_to_str(self.item_kind)
                         raise ValueError(f"item at index {i} is a {item.kind_name} instead of the expected {item_kind_name}")
-                    self.val_list.append(item)
-            elif self.tag_kind == TAG_COMPOUND and isinstance(tag_value, dict) and isinstance(tag_value, dict):
+                ## Keep the given list instead of copying it item by item (like the dict for a compound)
+                self.val_list = tag_value
+            elif self.tag_kind == TAG_COMPOUND and hasattr(tag_value, 'items'):
+                if not isinstance(tag_value, dict):
+                    ## Other mappings are copied into a dict
+                    tag_value = dict(tag_value.items())
                 for k, v in tag_value.items():
                     ## Do extra type-checking
                     if not isinstance(k, str): 
-                        raise TypeError(f"dictionary key is of type {type(v)} instead of 'str'")
+                        raise TypeError(f"dictionary key is of type {type(k)} instead of 'str'")
                     if not isinstance(v, TagPayload): 
                         raise TypeError(f"dictionary value is of type {type(v)} instead of 'TagPayload'")
+                    if v.tag_kind == TAG_END:
+                        raise ValueError(f"dictionary value for key '{k}' is a {v.kind_name}, which a compound cannot contain")
                 self.val_comp = tag_value
             elif self.tag_kind not in ALL_TAG_TYPES:
                 raise ValueError(f'TagPayload has invalid tag_kind: {self.tag_kind}')
@@ -165,7 +828,7 @@ class TagPayload:
         Get a very basic string representation. 
         NOTE: Use the nbtformat.printing submodule for a full string conversion.
         '''
-        if self.tag_kind in (TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG):
+        if self.tag_kind in _INTEGER_KINDS:
             info = str(self.val_int)
         elif self.tag_kind == TAG_STRING:
             info = f"\"{self.val_str}\""
@@ -177,7 +840,9 @@ class TagPayload:
 
     def __len__(self) -> int:
         '''Length for string, array, compound, and list-like tags only, get the length of this tag's value (the sub-element count)'''
-        if self.tag_kind in (TAG_LIST, TAG_BYTE_ARRAY, TAG_INT, TAG_LONG_ARRAY):
+        if self.val_array is not None:
+            return len(self.val_array)
+        elif self.tag_kind == TAG_LIST:
             return len(self.val_list)
         elif self.tag_kind == TAG_STRING:
             return len(self.val_str)
@@ -188,7 +853,11 @@ class TagPayload:
     
 
     def __getitem__(self, index: int | str) -> 'TagPayload':
-        if self.tag_kind in (TAG_LIST, TAG_BYTE_ARRAY, TAG_INT, TAG_LONG_ARRAY):
+        if self.val_array is not None:
+            if not isinstance(index, int):
+                raise TypeError(f"TagPayload of kind {self.kind_name} may only be indexed by {type(int)}, not {type(index)}")
+            return TagPayload._unchecked(self.item_kind, self.val_array[index])
+        elif self.tag_kind == TAG_LIST:
             if not isinstance(index, int):
                 raise TypeError(f"TagPayload of kind {self.kind_name} may only be indexed by {type(int)}, not {type(index)}")
             return self.val_list[index]
@@ -201,69 +870,43 @@ class TagPayload:
     
 
     def __setitem__(self, index: int | str, value: 'TagPayload'):
-        if self.tag_kind == TAG_LIST:
+        if self.val_array is not None:
             if not isinstance(index, int):
                 raise TypeError(f"TagPayload of kind {self.kind_name} may only be indexed by {type(int)}, not {type(index)}")
-            if self._list_item_kind != value.tag_kind:
-                raise ValueError(f"Cannot assign an element within a {value.kind_name} tag to a value of kind {value.kind_name}")
-            self.val_list[index] = value
-        elif self.tag_kind in (TAG_BYTE_ARRAY, TAG_INT, TAG_LONG_ARRAY):
+            if self.item_kind != value.tag_kind:
+                raise ValueError(f"Cannot assign an element within a {self.kind_name} tag to a value of kind {value.kind_name}")
+            self.val_array[index] = value.val_float if value.tag_kind in _FLOAT_KINDS else value.val_int
+        elif self.tag_kind == TAG_LIST:
             if not isinstance(index, int):
                 raise TypeError(f"TagPayload of kind {self.kind_name} may only be indexed by {type(int)}, not {type(index)}")
-            if tag_array_type_to_item_type(self.tag_kind) != value.tag_kind:
-                raise ValueError(f"Cannot assign an element within a {value.kind_name} tag to a value of kind {value.kind_name}")
+            if self._list_item_kind != value.tag_kind:
+                raise ValueError(f"Cannot assign an element within a {self.kind_name} tag to a value of kind {value.kind_name}")
             self.val_list[index] = value
         elif (self.tag_kind == TAG_COMPOUND):
             if not isinstance(index, str):
-                raise ValueError(f"Cannot assign an element within a {value.kind_name} tag to a value of kind {value.kind_name}")
+                raise TypeError(f"TagPayload of kind {self.kind_name} may only be indexed by {type(str)}, not {type(index)}")
+            if value.tag_kind == TAG_END:
+                raise ValueError(f"Cannot assign an element within a {self.kind_name} tag to a value of kind {value.kind_name}")
             self.val_comp[index] = value
         else:
             raise AttributeError(f"TagPayload of kind {self.kind_name} is not indexable")
     
 
     def write_to_file(self, file: BinaryIO | GzipFile) -> None:
-        '''Write the binary tag payload's data value to a file.'''
-        k = self._tag_kind
-        if k == TAG_END:
-            # No payload
-            return
-        elif k in (TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG):
-            # Integer kind
-            file.write(nbt_int_to_bytes(self.val_int, numeric_tag_size(self.tag_kind)))
-        elif k == TAG_FLOAT: 
-            # Float as standard float
-            n = file.write(struct.pack('>f', self.val_float))
-            assert(n == numeric_tag_size(k))
-        elif k == TAG_DOUBLE:
-            # Double as standard double
-            n = file.write(struct.pack('>d', self.val_float))
-            assert(n == numeric_tag_size(k))
-        elif k == TAG_STRING:
-            # String is length-encoded with an (unnamed) short value
-            TagShort(len(self.val_str)).write_to_file(file)
-            file.write(self.val_str.encode('utf-8'))
-        elif k in (TAG_LIST, TAG_BYTE_ARRAY, TAG_INT_ARRAY, TAG_LONG_ARRAY):
-            # Lists/arrays have an element count and then the elements
-            if k == TAG_LIST:
-                ## List additionally has an element type byte
-                TagByte(self._list_item_kind).write_to_file(file)
-            ## Element count
-            TagInt(len(self.val_list)).write_to_file(file)
-            ## Elements
-            for tag in self.val_list:
-                tag.write_to_file(file)
-        elif k == TAG_COMPOUND:
-            # Compound tag has named sub-tags up until a tag_end at this level
-            for name, tag in self.val_comp.items():
-                if tag.tag_kind == TAG_END:
-                    ## Stop if a tag_end is encountered early
-                    break
-                NamedTag(name, tag).write_to_file(file)
-            ## Write the tag_end tag
-            NamedTag().write_to_file(file)
-        else:
-            # Invalid tag_kind
-            raise ValueError(f"cannot save this TagPayload because it has an unhandled/invalid 'tag_kind': {k}")
+        '''Write the binary tag payload's data value to a file (with a single write call).'''
+        file.write(bytes(self))
+    
+
+    def __bytes__(self) -> bytes:
+        '''Get the binary tag payload's data value.'''
+        parts: list[bytes] = []
+        self._write(parts.append)
+        return b''.join(parts)
+    
+
+    def _write(self, write: Callable[[bytes], Any]) -> None:
+        '''Write the binary tag payload's data value, one piece of bytes at a time, with the given 'write' function.'''
+        _PAYLOAD_WRITERS[self._tag_kind](self, write)
     
 
     @property
@@ -275,7 +918,7 @@ class TagPayload:
     @property
     def kind_name(self) -> str: 
         '''Get the name string for the kind of tag this is.'''
-        return tag_kind_to_str(self._tag_kind)
+        return _KIND_NAMES[self._tag_kind]
     
 
     @property
@@ -292,60 +935,92 @@ class NamedTag:
     The binary format for this is [tag-type, a TagByte], and then [name, a TagString], and finally [payload, a Tag].
     '''
 
+    __slots__ = ('name', 'payload')
+
     @classmethod
-    def read_from_file(cls, file: BinaryIO | GzipFile | str) -> 'NamedTag':
+    def read_from_file(cls, file: BinaryIO | GzipFile | str | os.PathLike, lazy: bool = False) -> 'NamedTag':
         '''
         Read a named tag from a file or file path. If EOF is reached, return a 'TagEnd' tag.
+        If 'lazy' is True, a compound tag is read as a 'TagCompoundLazy', which only decodes each sub-tag when it is first accessed.
         NOTE: because of this behavior, a file may omit the trail of ending TagEnd tag(s) to close the top-level TagCompound(s).
+        NOTE: the rest of the file is read into memory and parsed with 'read_from_bytes'. If the file is seekable, it is left positioned just past the named tag.
         '''
-        if isinstance(file, str):
+        if isinstance(file, (str, os.PathLike)):
             with open(file, "rb") as arg:
-                return cls._read_from_file(arg)
+                if os.fstat(arg.fileno()).st_size == 0:
+                    return _END_NAMED_TAG
+                ## Parse directly out of the memory-mapped file instead of making many small reads
+                with mmap.mmap(arg.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as buf:
+                    return cls.read_from_bytes(buf, lazy=lazy)[0]
         else:
-            return cls._read_from_file(file)
+            data = file.read()
+            named_tag, offset = cls.read_from_bytes(data, lazy=lazy)
+            _unread(file, len(data) - offset)
+            return named_tag
     
 
     @classmethod
-    def _read_from_file(cls, file: BinaryIO | GzipFile) -> 'NamedTag':
+    def read_from_bytes(cls, buf: bytes | bytearray | memoryview, offset: int = 0, lazy: bool = False) -> tuple['NamedTag', int]:
         '''
-        Read a named tag from a file. If EOF is reached, return a 'TagEnd' tag.
-        NOTE: because of this behavior, a file may omit the trail of ending TagEnd tag(s) to close the top-level TagCompound(s).
+        Read a named tag from a bytes-like buffer, starting at 'offset'. If the end of the buffer is reached, return a 'TagEnd' tag.
+        NOTE: a tag_end named tag that is returned is a shared instance, so it should not be modified.
+        If 'lazy' is True, a compound tag is read as a 'TagCompoundLazy', which only decodes each sub-tag when it is first accessed.
+        Returns the named tag and the offset just past its data.
         '''
-        ## Read the tag type byte
-        try:
-            kind = TagPayload.read_from_file(TAG_BYTE, file)
-        except (IndexError, EOFError):
-            return NamedTag()
-        if kind.val_int not in ALL_TAG_TYPES:
-            raise ValueError(f"encountered invalid tag type byte value: {kind.val_int} while reading file")
-        
-        if kind.val_int == TAG_END:
+        ## Check the tag type byte
+        if offset >= len(buf):
+            return _END_NAMED_TAG, offset
+        kind = buf[offset]
+        if kind >= len(_PAYLOAD_READERS):
+            raise ValueError(f"encountered invalid tag type byte value: {kind} while reading buffer")
+
+        if kind == TAG_END:
             ## Special case: don't read a name or payload for a tag_end (it doesn't have a name or payload)
-            return NamedTag()
-        
-        ## Read the tag name (string tag)
-        name_tag = TagPayload.read_from_file(TAG_STRING, file)
-        ## Read the tag payload
-        data_tag = TagPayload.read_from_file(kind.val_int, file)
-        return NamedTag(name_tag.val_str, data_tag)
+            return _END_NAMED_TAG, offset + 1
+
+        try:
+            ## Read the tag type byte and the name length together, and then the name
+            kind, name_len = _S_NAMED_HEADER.unpack_from(buf, offset)
+            offset += _SIZE_NAMED_HEADER
+            name = _read_name(buf, offset, offset + name_len)
+            offset += name_len
+            ## Read the tag payload
+            if lazy and kind == TAG_COMPOUND:
+                data_tag, offset = _read_lazy_compound(kind, buf, offset)
+            else:
+                data_tag, offset = _PAYLOAD_READERS[kind](kind, buf, offset)
+        except _END_OF_DATA_ERRORS as e:
+            raise _end_of_data_error(e) from e
+        return NamedTag(name, data_tag), offset
 
 
     def __init__(self, name: str = '', payload: TagPayload | None = None):
         '''Create a 'NamedTag' with a 'name' string and a 'payload' NBT tag . If given no arguments, creates an unnamed tag_end tag.'''
         self.name: str = str(name)
-        self.payload: TagPayload = TagEnd() if (payload is None) else payload
+        self.payload: TagPayload = _TAG_END if (payload is None) else payload
     
 
-    def write_to_file(self, file: BinaryIO | GzipFile) -> None:
-        '''Write this named tag's binary representation to the given file, which is type, name, and then data'''
-        ## Write the tag type byte
-        TagPayload(TAG_BYTE, self.payload.tag_kind).write_to_file(file)
-        if self.payload.tag_kind == TAG_END:
-            ## Special case: tag_end tags don't have a name or payload
-            return
-        ## Write the name and payload
-        TagString(self.name).write_to_file(file)
-        self.payload.write_to_file(file)
+    def write_to_file(self, file: BinaryIO | GzipFile | str) -> None:
+        '''Write this named tag's binary representation to the given file or file path, which is type, name, and then data'''
+        if isinstance(file, str):
+            ## Use a large write buffer, because a tag is written as many small pieces
+            with open(file, "wb", buffering=_WRITE_BUFFER_SIZE) as arg:
+                self._write(arg.write)
+        else:
+            ## Join the pieces and write them all at once, because each write to a file object (such as a GzipFile) has a large overhead
+            file.write(bytes(self))
+    
+
+    def __bytes__(self) -> bytes:
+        '''Get this named tag's binary representation, which is type, name, and then data'''
+        parts: list[bytes] = []
+        self._write(parts.append)
+        return b''.join(parts)
+    
+
+    def _write(self, write: Callable[[bytes], Any]) -> None:
+        '''Write this named tag's binary representation, one piece of bytes at a time, with the given 'write' function.'''
+        _write_named_tag(write, self.name, self.payload)
     
 
     def __getitem__(self, key: str | int) -> TagPayload:
@@ -366,77 +1041,159 @@ class TagEnd(TagPayload):
     NOTE: TAG_END is often used as a default or error value in this file.
     NOTE: TagCompound automatically handles putting a tag_end tag at the end of its data.
     '''
+    __slots__ = ()
     def __init__(self, ):
         super().__init__(TAG_END)
 
 
+# Shared instances for the tag_end payload and tag_end named tag, which are created very often while reading and writing
+_TAG_END = TagEnd()
+_END_NAMED_TAG = NamedTag('', _TAG_END)
+
+
 class TagByte(TagPayload):
     '''Single byte integer value.'''
+    __slots__ = ()
     def __init__(self, val: int):
         super().__init__(TAG_BYTE, val)
 
 
 class TagShort(TagPayload):
     '''Short integer value.'''
+    __slots__ = ()
     def __init__(self, val: int):
         super().__init__(TAG_SHORT, val)
 
 
 class TagInt(TagPayload):
     '''Integer value.'''
+    __slots__ = ()
     def __init__(self, val: int):
         super().__init__(TAG_INT, val)
 
 
 class TagLong(TagPayload):
     '''Long integer value.'''
+    __slots__ = ()
     def __init__(self, val: int):
         super().__init__(TAG_LONG, val)
 
 
 class TagFloat(TagPayload):
     '''Single-precision floating-point value.'''
+    __slots__ = ()
     def __init__(self, val: float):
         super().__init__(TAG_FLOAT, val)
 
 
 class TagDouble(TagPayload):
     '''Double-precision floating-point value.'''
+    __slots__ = ()
     def __init__(self, val: float):
         super().__init__(TAG_DOUBLE, val)
 
 
 class TagByteArray(TagPayload):
     '''Fixed array of bytes.'''
-    def __init__(self, val: int):
+    __slots__ = ()
+    def __init__(self, val: bytes | bytearray | Iterable[int] | list[TagPayload] | None = None):
         super().__init__(TAG_BYTE_ARRAY, val)
 
 
 class TagString(TagPayload):
     '''Sequence of UTF-8 encoded characters.'''
+    __slots__ = ()
     def __init__(self, val: str):
         super().__init__(TAG_STRING, val)
 
 
 class TagList(TagPayload):
-    '''List of homogenous NBT data values.'''
-    def __init__(self, item_type: int, values: list[TagPayload] | None = None):
+    '''
+    List of homogenous NBT data values.
+    NOTE: a list of numbers keeps its values packed in 'val_array' (and indexing it creates a new TagPayload), while any other list keeps its tags in 'val_list'.
+    '''
+    __slots__ = ()
+    def __init__(self, item_type: int, values: Iterable[TagPayload] | Iterable[int] | Iterable[float] | None = None):
         super().__init__(TAG_LIST, values, list_item_kind=item_type)
 
 
 class TagCompound(TagPayload):
     '''Collection that maps string names to tag payloads. The tag_end tag marks the end of a tag_compound's data.'''
+    __slots__ = ()
     def __init__(self, values: Mapping[str, TagPayload] | None = None):
         super().__init__(TAG_COMPOUND, values)
 
 
+class TagCompoundLazy(TagCompound):
+    '''
+    Compound that keeps its encoded data and only decodes each named sub-tag when it is first accessed (sub-compounds are lazy as well).
+    Accessing 'val_comp' (for example, by printing or modifying the compound) decodes all of the remaining sub-tags.
+    If none of the sub-tags were decoded, writing this compound copies out the original data directly.
+    Create these by reading with 'lazy=True', such as 'NamedTag.read_from_file(file, lazy=True)'.
+    '''
+    __slots__ = ('_data', '_entries')
+    def __init__(self, data: bytes, entries: dict[str, tuple[int, int]]):
+        ## (the entries are set after the empty compound is initialized, because assigning 'val_comp' clears them)
+        super().__init__()
+        ## Map of sub-tag names to (tag kind, payload offset within 'data'), or None after everything is decoded
+        self._entries: dict[str, tuple[int, int]] | None = entries
+        self._data: bytes = data
+
+    @property
+    def val_comp(self) -> dict[str, TagPayload]:
+        '''The dictionary of all of the sub-tags (decoding any that haven't been accessed yet).'''
+        decoded = _COMPOUND_VAL_COMP.__get__(self)
+        if self._entries is not None:
+            result = { name: decoded[name] if name in decoded else self._decode(name) for name in self._entries }
+            result.update(decoded)
+            _COMPOUND_VAL_COMP.__set__(self, result)
+            self._entries = None
+            return result
+        return decoded
+
+    @val_comp.setter
+    def val_comp(self, value: dict[str, TagPayload]) -> None:
+        ## The new dictionary replaces all of the contents, including the sub-tags that were never decoded
+        _COMPOUND_VAL_COMP.__set__(self, value)
+        self._entries = None
+
+    def __getitem__(self, index: int | str) -> TagPayload:
+        if self._entries is not None and isinstance(index, str):
+            decoded = _COMPOUND_VAL_COMP.__get__(self)
+            if index not in decoded:
+                decoded[index] = self._decode(index)
+            return decoded[index]
+        return super().__getitem__(index)
+
+    def _decode(self, name: str) -> TagPayload:
+        '''Decode the sub-tag with the given name from the original data.'''
+        kind, offset = self._entries[name]
+        if kind == TAG_COMPOUND:
+            return _read_lazy_compound(kind, self._data, offset)[0]
+        return _PAYLOAD_READERS[kind](kind, self._data, offset)[0]
+
+    def _write(self, write: Callable[[bytes], Any]) -> None:
+        if self._entries is not None and not _COMPOUND_VAL_COMP.__get__(self):
+            ## Nothing was decoded (so nothing could have been modified), so write the original data and the tag_end
+            write(self._data)
+            write(_END_BYTES)
+        else:
+            super()._write(write)
+
+
+# The slot descriptor that holds a compound's dictionary (which TagCompoundLazy overrides with a property)
+_COMPOUND_VAL_COMP = TagPayload.val_comp
+
+
 class TagIntArray(TagPayload):
     '''Fixed array of integers.'''
-    def __init__(self, values: list[TagPayload] | None = None):
+    __slots__ = ()
+    def __init__(self, values: Iterable[int] | list[TagPayload] | None = None):
         super().__init__(TAG_INT_ARRAY, values)
 
 
 class TagLongArray(TagPayload):
     '''Fixed array of long integers.'''
-    def __init__(self, values: list[TagPayload] | None = None):
+    __slots__ = ()
+    def __init__(self, values: Iterable[int] | list[TagPayload] | None = None):
         super().__init__(TAG_LONG_ARRAY, values)
@@ -1,65 +1,240 @@
+import sys
+
 from .constants import *
 from .full import *
+from .full import _PAYLOAD_READERS, _S_LIST_HEADER, _S_NAMED_HEADER, _SIZE_LIST_HEADER, _SIZE_NAMED_HEADER, _END_OF_DATA_ERRORS, _end_of_data_error, _read_name
 
-def print_tag(tag: TagPayload | NamedTag, indent=0, indent_str='  ', within_list=False, _name=''): 
-    '''Print out an NBT tag and all of its contents in the same way examples are given in the original NBT specification.'''
+def print_tag(tag: TagPayload | NamedTag, indent=0, indent_str='  ', within_list=False, _name='', file=None): 
+    '''Print out an NBT tag and all of its contents in the same way examples are given in the original NBT specification.
+    The output is collected and written to `file` (default: sys.stdout) in one call.'''
     if not isinstance(tag, (NamedTag, TagPayload)):
         raise TypeError(f"`tag` is not a `TagPayload` or a `NamedTag`, it is of type '{type(tag)}'")
     
     if isinstance(tag, NamedTag):
         # Unwrap named tag as a name argument
-        print_tag(tag.payload, indent, indent_str, within_list, _name=tag.name)
-        return
+        tag, _name = tag.payload, tag.name
+
+    if file is None:
+        file = sys.stdout
 
     if tag.tag_kind == TAG_END:
-        print(end = indent_str * (indent - 1))
-        print(end="}")
+        file.write(indent_str * (indent - 1) + "}")
         return
-    
-    # Print type and possibly the tag's name
-    print(end = indent_str * indent)
-    tag_type_name = tag.kind_name
-    if _name and (not within_list):
-        print(end=f"{tag_type_name}(\"{_name}\"): ")
-    else:
-        print(end=f"{tag_type_name}: ")
-
-    # Print the tag data payload
-    if tag.tag_kind in (TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG):
-        print(end=str(tag.val_int))
-    elif tag.tag_kind in (TAG_FLOAT, TAG_DOUBLE):
-        print(end=str(tag.val_float))
-    elif tag.tag_kind == TAG_STRING:
-        print(end=f"\"{tag.val_str}\"")
-    elif tag.tag_kind == TAG_BYTE_ARRAY:
-        if len(tag) > 10:
-            print(end=f"[{len(tag)} bytes...]")
+
+    if within_list:
+        _name = ''
+
+    # Walk the tree with an explicit stack. Each entry is either a (tag, indent, name) triple to print, or a string that closes a list or compound.
+    # Bind the names used for every tag to locals, since local lookups are cheaper than global and attribute lookups
+    parts = []
+    write = parts.append
+    stack = [(tag, indent, _name)]
+    pop = stack.pop
+    push = stack.append
+    push_all = stack.extend
+    kind_prefix = _KIND_PREFIX
+    kind_named_prefix = _KIND_NAMED_PREFIX
+    formatters = _PAYLOAD_FORMATTERS
+    while stack:
+        item = pop()
+        if item.__class__ is str:
+            write(item)
+            continue
+        tag, indent, name = item
+
+        # Print type and possibly the tag's name
+        tag_kind = tag._tag_kind
+        write(indent_str * indent)
+        write(kind_named_prefix[tag_kind] % name if name else kind_prefix[tag_kind])
+
+        # Print the tag data payload, pushing the contents of lists and compounds in reverse so they pop in order
+        if tag_kind == TAG_LIST:
+            write(_LIST_HEADER[tag._list_item_kind] % len(tag))
+            push(indent_str * indent + "}\n")
+            push_all([ (tag[i], indent + 1, '') for i in reversed(range(len(tag))) ])
+        elif tag_kind == TAG_COMPOUND:
+            write("%d entries {\n" % len(tag))
+            push(indent_str * indent + "}\n")
+            push_all([ (tag_val, indent + 1, tag_name) for tag_name, tag_val in reversed(tag.val_comp.items()) ])
         else:
-            print(end="[ ")
-            for b in tag.val_list:
-                print(end = f"{b:02X} ")
-            print(end="]")
-    elif tag.tag_kind == TAG_LIST:
-        inner_type_name = tag_kind_to_str(tag._list_item_kind)
-        print(f"{len(tag)} entries of type {inner_type_name} {{")
-        for tag_i in tag.val_list:
-            print_tag(tag_i, indent = indent + 1, indent_str = indent_str, within_list = True)
-        print(end = indent_str * indent)
-        print(end="}")
-    elif tag.tag_kind == TAG_COMPOUND:
-        print(f"{len(tag)} entries {{")
-        for tag_name, tag_val in tag.val_comp.items():
-            print_tag(tag_val, indent = indent + 1, indent_str = indent_str, _name=tag_name)
-        print(end = indent_str * (indent))
-        print(end="}")
-    elif tag.tag_kind in (TAG_INT_ARRAY, TAG_LONG_ARRAY):
-        item_type = 'ints' if tag.tag_kind == TAG_INT_ARRAY else 'longs'
-        if len(tag) > 10:
-            print(end=f"[{len(tag)} {item_type}...]")
+            write(formatters[tag_kind](tag))
+            # Newline
+            write("\n")
+
+    file.write(''.join(parts))
+
+
+def print_tag_from_bytes(buf: bytes | bytearray | memoryview, offset: int = 0, indent_str='  ', file=None) -> int:
+    '''
+    Print out the named tag encoded in a bytes-like buffer at 'offset' (the same way as 'print_tag'), straight from the buffer without creating the tag objects for its compounds and lists.
+    The buffer is only read once, and a compound's output is held until it ends (so its entry count can be printed before its entries).
+    So if the named tag is a compound (the usual case), all of the output is held in memory and written to 'file' (default: sys.stdout) at the end. Otherwise, it is written in pieces as it goes.
+    Returns the offset just past the named tag.
+    '''
+    if file is None:
+        file = sys.stdout
+    try:
+        return _print_tag_from_bytes(buf, offset, indent_str, file)
+    except _END_OF_DATA_ERRORS as e:
+        raise _end_of_data_error(e) from e
+
+
+def _print_tag_from_bytes(buf: bytes | bytearray | memoryview, offset: int, indent_str: str, file) -> int:
+    '''Print out the named tag encoded in a buffer for 'print_tag_from_bytes' (which turns the errors from reading past the end of the buffer into a 'ValueError').'''
+    if offset >= len(buf) or buf[offset] == TAG_END:
+        file.write("}")
+        return min(offset + 1, len(buf))
+
+    parts = []
+    write = parts.append
+    readers = _PAYLOAD_READERS
+    kind, name_len = _S_NAMED_HEADER.unpack_from(buf, offset)
+    if kind >= len(readers):
+        raise ValueError(f"encountered invalid tag type byte value: {kind} while reading buffer")
+    offset += _SIZE_NAMED_HEADER
+    name = _read_name(buf, offset, offset + name_len)
+    offset += name_len
+    indent = 0
+
+    # Each stack frame is [indent, is a compound, entry count so far (for a compound) or remaining item count (for a list), item type (for a list)]
+    stack = []
+    # Indexes in 'parts' of the headers of the compounds in the stack (their output can't be written until they end), and the number of parts at the start of 'parts' that were already joined
+    held_headers = []
+    joined_count = 0
+    while True:
+        # Print type and possibly the tag's name, and then the payload or the header of a compound or list
+        write(indent_str * indent)
+        write(_KIND_NAMED_PREFIX[kind] % name if name else _KIND_PREFIX[kind])
+        if kind == TAG_COMPOUND:
+            # Leave a place for the header, which is filled in when the compound ends
+            stack.append([indent, True, 0, TAG_END])
+            held_headers.append(len(parts))
+            write('')
+        elif kind == TAG_LIST:
+            item_kind, item_count = _S_LIST_HEADER.unpack_from(buf, offset)
+            if not (0 <= item_kind < len(readers)):
+                raise ValueError(f"cannot read a list with invalid item tag kind: {item_kind}")
+            offset += _SIZE_LIST_HEADER
+            item_count = max(item_count, 0)
+            write(_LIST_HEADER[item_kind] % item_count)
+            stack.append([indent, False, item_count, item_kind])
+        else:
+            payload, offset = readers[kind](kind, buf, offset)
+            write(_PAYLOAD_FORMATTERS[kind](payload))
+            write("\n")
+
+        # Every once in a while, write out the output so far, or if a compound is waiting for its header, join the output after that header into one string
+        if len(parts) - joined_count >= 4096:
+            if not held_headers:
+                file.write(''.join(parts))
+                parts.clear()
+                joined_count = 0
+            else:
+                _join_held_parts(parts, held_headers, joined_count)
+                joined_count = len(parts)
+
+        # Find the next tag to print, closing any compounds and lists that have ended
+        while stack:
+            frame = stack[-1]
+            if frame[1]:
+                if offset >= len(buf) or buf[offset] == TAG_END:
+                    ## Skip the compound's tag_end (unless the buffer ended without one)
+                    offset = min(offset + 1, len(buf))
+                    parts[held_headers.pop()] = "%d entries {\n" % frame[2]
+                    write(indent_str * frame[0] + "}\n")
+                    stack.pop()
+                    continue
+                kind, name_len = _S_NAMED_HEADER.unpack_from(buf, offset)
+                if kind >= len(readers):
+                    raise ValueError(f"encountered invalid tag type byte value: {kind} while reading buffer")
+                offset += _SIZE_NAMED_HEADER
+                name = _read_name(buf, offset, offset + name_len)
+                offset += name_len
+                frame[2] += 1
+            else:
+                if frame[2] == 0:
+                    write(indent_str * frame[0] + "}\n")
+                    stack.pop()
+                    continue
+                if offset >= len(buf):
+                    raise ValueError(f"not enough data for the {frame[2]} remaining items of a list")
+                frame[2] -= 1
+                kind = frame[3]
+                name = ''
+            indent = frame[0] + 1
+            break
         else:
-            print(end=str(tag.val_list))
+            break
+
+    file.write(''.join(parts))
+    return offset
+
+
+def _join_held_parts(parts: list[str], held_headers: list[int], start: int) -> None:
+    '''Join the output parts from 'start' onwards into as few strings as possible, keeping apart the compound headers that are not filled in yet (and updating their indexes).'''
+    joined = []
+    part_start = start
+    for i, header_index in enumerate(held_headers):
+        if header_index < part_start:
+            continue
+        joined.append(''.join(parts[part_start:header_index]))
+        held_headers[i] = start + len(joined)
+        joined.append(parts[header_index])
+        part_start = header_index + 1
+    joined.append(''.join(parts[part_start:]))
+    parts[start:] = joined
+
+
+# Pre-formatted strings for each tag type, indexed by tag type
+_KIND_PREFIX = tuple([ f"{n}: " for n in TAG_NAMES ])
+_KIND_NAMED_PREFIX = tuple([ f"{n}(\"%s\"): " for n in TAG_NAMES ])
+_LIST_HEADER = tuple([ f"%d entries of type {n} {{\n" for n in TAG_NAMES ])
+
+
+def _format_integer(tag: TagPayload) -> str:
+    return str(tag.val_int)
+
+
+def _format_float(tag: TagPayload) -> str:
+    return str(tag.val_float)
+
+
+def _format_string(tag: TagPayload) -> str:
+    return f"\"{tag.val_str}\""
+
+
+def _format_byte_array(tag: TagPayload) -> str:
+    if len(tag) > 10:
+        return f"[{len(tag)} bytes...]"
     else:
-        raise TypeError(f"cannot print tag kind {tag.tag_kind}")
-    # Newline
-    print()
-    
\ No newline at end of file
+        hex_bytes = tag.val_array.tobytes().hex(' ').upper()
+        return f"[ {hex_bytes} ]" if hex_bytes else "[ ]"
+
+
+def _format_int_or_long_array(tag: TagPayload) -> str:
+    item_type = 'ints' if tag.tag_kind == TAG_INT_ARRAY else 'longs'
+    if len(tag) > 10:
+        return f"[{len(tag)} {item_type}...]"
+    else:
+        return str(tag.val_array.tolist())
+
+
+# Functions that format a tag's data payload as a string, indexed by tag type
+_PAYLOAD_FORMATTERS = (
+    None,                      # TAG_END (handled by print_tag)
+    _format_integer,           # TAG_BYTE
+    _format_integer,           # TAG_SHORT
+    _format_integer,           # TAG_INT
+    _format_integer,           # TAG_LONG
+    _format_float,             # TAG_FLOAT
+    _format_float,             # TAG_DOUBLE
+    _format_byte_array,        # TAG_BYTE_ARRAY
+    _format_string,            # TAG_STRING
+    None,                      # TAG_LIST (handled by print_tag)
+    None,                      # TAG_COMPOUND (handled by print_tag)
+    _format_int_or_long_array, # TAG_INT_ARRAY
+    _format_int_or_long_array, # TAG_LONG_ARRAY
+)
+
+# Static check to make sure no tag types were missed
+assert(len(_PAYLOAD_FORMATTERS) == len(ALL_TAG_TYPES))
@@ -0,0 +1,36 @@
+import io
+
+from nbtformat import *
+from nbtformat.printing import print_tag_from_bytes
+
+# Corrupt or truncated data should raise a 'ValueError' (and never loop or allocate without end), however it is read
+corrupt_data = [
+    # Compound with a byte tag that has a negative name length
+    bytes([10,0,1,114, 1,0xFF,0xFC,5, 0,0]),
+    # Same, but within a nested compound
+    bytes([10,0,1,114, 10,0,1,99, 1,0xFF,0xFC,5,0,0,0]),
+    # Compound with a string tag that has a negative length
+    bytes([10,0,1,114, 8,0,1,115, 0xFF,0xFC, 0]),
+    # Lists that claim to have many more items than the data that is left could hold
+    bytes([10,0,1,114, 9,0,1,108, 10, 0x7f,0xff,0xff,0xff]),
+    bytes([10,0,1,114, 9,0,1,108, 8, 0x7f,0xff,0xff,0xff]),
+    bytes([10,0,1,114, 9,0,1,108, 8, 0x08,0x00,0x00,0x00]),
+]
+
+readers = {
+    'read_from_bytes': lambda data: NamedTag.read_from_bytes(data),
+    'read_from_bytes lazy': lambda data: NamedTag.read_from_bytes(data, lazy=True)[0].payload.val_comp,
+    'find_tag': lambda data: find_tag(data, ['x']),
+    'print_tag_from_bytes': lambda data: print_tag_from_bytes(data, file=io.StringIO()),
+}
+
+for i, data in enumerate(corrupt_data):
+    for reader_name, reader in readers.items():
+        try:
+            reader(data)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{reader_name} did not raise a ValueError for corrupt data #{i}")
+
+print("corrupt data OK")
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-import gzip, sys
+import sys
 import nbtformat, nbtformat.printing
 
 # Get argument
@@ -10,17 +10,9 @@ if len(sys.argv) != 2:
 filename = sys.argv[1]
 
 try:
-    try:
-        # Try the file as a compressed file
-        with gzip.open(filename, "rb") as f1:
-            tag1 = nbtformat.NamedTag.read_from_file(f1)
-            nbtformat.printing.print_tag(tag1)
-    except gzip.BadGzipFile:
-        # Try the file as uncompressed file
-        print(f"[WARNING]: the file \"{filename}\" is not a gzipped file. Now trying to read the file as uncompressed...")
-        with open(filename, "rb") as f2:
-            tag2 = nbtformat.NamedTag.read_from_file(f2)
-            nbtformat.printing.print_tag(tag2)
+    # Read the file, which may be compressed or uncompressed, and print it straight from its data
+    data = nbtformat.read_nbt_data(filename)
+    nbtformat.printing.print_tag_from_bytes(data)
     exit(0)
 except FileNotFoundError as e:
     print(e)
@@ -0,0 +1,22 @@
+import copy
+import os
+import pickle
+
+from nbtformat import *
+
+if __name__ == '__main__':
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bigtest.nbt")
+    x = read_nbt(path)
+
+    # Tags are sent back from the worker processes by pickling them, so check that pickling and copying a read tag keeps it the same
+    assert bytes(pickle.loads(pickle.dumps(x))) == bytes(x)
+    assert bytes(copy.deepcopy(x)) == bytes(x)
+
+    # Read the file with several worker processes (more than one path and more than one worker uses the process pool)
+    results = read_nbt_files([path, path, path], max_workers=2)
+    assert len(results) == 3
+    for y in results:
+        assert y.name == x.name
+        assert bytes(y) == bytes(x)
+
+    print("read_nbt_files OK")
@@ -2,23 +2,61 @@
 Convert S-expressions to NBT data structure.
 '''
 
+import re
+
 import nbtformat
 import nbtformat.constants
 import nbtformat.printing
 
 TYPE_NAMES = ("compound", "string", "int", "list", "short", "byte", "long", "float", "double")
 
+# Pattern that matches any of the type names in one call (longest names first, so that a name is never cut short by another name that is its prefix)
+_TYPE_NAME_RE = re.compile('|'.join(sorted(TYPE_NAMES, key=len, reverse=True)))
+
+# Patterns for the number literals, so that they are scanned by the regex engine instead of character by character
+_INT_RE = re.compile(r'[+-]?\d+')
+_FLOAT_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+
+# Pattern for skipping whitespace (without making a stripped copy of the rest of the text)
+_SPACE_RE = re.compile(r'\s*')
+
+# Map each type name to its tag type
+_TYPE_IDS = {
+    "compound": nbtformat.TAG_COMPOUND,
+    "string": nbtformat.TAG_STRING,
+    "int": nbtformat.TAG_INT,
+    "list": nbtformat.TAG_LIST,
+    "short": nbtformat.TAG_SHORT,
+    "byte": nbtformat.TAG_BYTE,
+    "float": nbtformat.TAG_FLOAT,
+    "double": nbtformat.TAG_DOUBLE,
+    "long": nbtformat.TAG_LONG,
+}
+
+# Map each type name (except for "list", which also needs an item type) to its tag class
+_TAG_CLASSES = {
+    "byte": nbtformat.TagByte,
+    "short": nbtformat.TagShort,
+    "int": nbtformat.TagInt,
+    "long": nbtformat.TagLong,
+    "float": nbtformat.TagFloat,
+    "double": nbtformat.TagDouble,
+    "string": nbtformat.TagString,
+    "compound": nbtformat.TagCompound,
+}
+
 def type_name_to_id(type_name) -> int:
-    if type_name == "compound": return nbtformat.TAG_COMPOUND
-    if type_name == "string": return nbtformat.TAG_STRING
-    if type_name == "int": return nbtformat.TAG_INT
-    if type_name == "list": return nbtformat.TAG_LIST
-    if type_name == "short": return nbtformat.TAG_SHORT
-    if type_name == "byte": return nbtformat.TAG_BYTE
-    if type_name == "float": return nbtformat.TAG_FLOAT
-    if type_name == "double": return nbtformat.TAG_DOUBLE
-    if type_name == "long": return nbtformat.TAG_LONG
-    raise ValueError(type_name)
+    try:
+        return _TYPE_IDS[type_name]
+    except KeyError:
+        raise ValueError(type_name) from None
+
+class Cursor:
+    '''Position within the S-expression text being parsed, so that the parsing functions can move forward without making copies of the rest of the text.'''
+    __slots__ = ('s', 'i')
+    def __init__(self, s: str, i: int = 0):
+        self.s = s
+        self.i = i
 
 '''
 (compound "root1" ())
@@ -29,114 +67,156 @@ def type_name_to_id(type_name) -> int:
 def sexpr_to_nbt(sexpr: str) -> tuple[nbtformat.NamedTag, str]:
     if not sexpr:
         raise ValueError()
-    sexpr = skip_space(sexpr)
-    _, sexpr = expect_string('(', sexpr)
-    sexpr = skip_space(sexpr)
-    type_name, sexpr = expect_type_name('', sexpr)
-    sexpr = skip_space(sexpr)
-    name, sexpr = expect_quoted_string(sexpr)
-    sexpr = skip_space(sexpr)
-    tag, sexpr = sexpr_to_bt(type_name, sexpr)
-    _, sexpr = expect_string(')', sexpr)
-    return nbtformat.NamedTag(name, tag), sexpr
-
-def sexpr_to_bt(type_name: str, sexpr: str) -> tuple[nbtformat.TagPayload, str]:
-    if type_name in ('byte', 'short', 'int', 'long'):
-        val1, sexpr = expect_int(sexpr)
-        return make_tag(type_name, val1), sexpr
-    elif type_name in ('float', 'double'):
-        val4, sexpr = expect_float(sexpr)
-        return make_tag(type_name, val4), sexpr
-    elif type_name == 'string':
-        val2, sexpr = expect_quoted_string(sexpr)
-        return make_tag(type_name, val2), sexpr
-    elif type_name == 'compound':
-        values: list[nbtformat.NamedTag] = []
-        _, sexpr = expect_string('(', sexpr)
-        sexpr = skip_space(sexpr)
-        while sexpr and not sexpr.startswith(')'):
-            val3, sexpr = sexpr_to_nbt(sexpr)
-            values.append(val3)
-            sexpr = skip_space(sexpr)
-        _, sexpr = expect_string(')', sexpr)
-        values_dict = { nt.name: nt.payload for nt in values }
-        return make_tag(type_name, values_dict), sexpr
-    elif type_name == 'list':
-        values2: list[nbtformat.TagPayload] = []
-        list_type_name, sexpr = expect_type_name('', sexpr)
-        sexpr = skip_space(sexpr)
-        _, sexpr = expect_string('(', sexpr)
-        sexpr = skip_space(sexpr)
-        while sexpr and not sexpr.startswith(')'):
-            val5, sexpr = sexpr_to_bt(list_type_name, sexpr)
-            values2.append(val5)
-            sexpr = skip_space(sexpr)
-        _, sexpr = expect_string(')', sexpr)
-        return make_tag(type_name, values2, list_type=type_name_to_id(list_type_name)), sexpr
-    else:
-        raise NotImplementedError(type_name)
+    cur = Cursor(sexpr)
+    named_tag = expect_named_tag(cur)
+    return named_tag, sexpr[cur.i:]
+
+def expect_named_tag(cur: Cursor) -> nbtformat.NamedTag:
+    name, tag = expect_named_pair(cur)
+    return nbtformat.NamedTag(name, tag)
+
+def expect_named_pair(cur: Cursor) -> tuple[str, nbtformat.TagPayload]:
+    skip_space(cur)
+    expect_string('(', cur)
+    skip_space(cur)
+    type_name = expect_type_name('', cur)
+    skip_space(cur)
+    name = expect_quoted_string(cur)
+    skip_space(cur)
+    tag = sexpr_to_bt(type_name, cur)
+    expect_string(')', cur)
+    return name, tag
+
+def sexpr_to_bt(type_name: str, cur: Cursor) -> nbtformat.TagPayload:
+    '''Parse the value of a tag of the given type, along with any compounds and lists nested within it.'''
+    # Each stack frame is [values of an open compound or list, item type name of the list (None for a compound), name of the compound's current entry]
+    stack = []
+    text_len, starts_with = len(cur.s), cur.s.startswith
+    while True:
+        # Parse a value, which either gives a tag or opens a compound or list (tag is None)
+        if type_name in ('byte', 'short', 'int', 'long'):
+            tag = make_tag(type_name, expect_int(cur))
+        elif type_name in ('float', 'double'):
+            tag = make_tag(type_name, expect_float(cur))
+        elif type_name == 'string':
+            tag = make_tag(type_name, expect_quoted_string(cur))
+        elif type_name == 'compound':
+            expect_string('(', cur)
+            skip_space(cur)
+            stack.append([{}, None, None])
+            tag = None
+        elif type_name == 'list':
+            list_type_name = expect_type_name('', cur)
+            skip_space(cur)
+            expect_string('(', cur)
+            skip_space(cur)
+            expect_number = _NUMBER_PARSERS.get(list_type_name)
+            if expect_number is None:
+                stack.append([[], list_type_name, None])
+                tag = None
+            else:
+                # Numbers are collected as plain values (a list of numbers stores them packed, so it doesn't need a tag for each of them)
+                values: list = []
+                append = values.append
+                while cur.i < text_len and not starts_with(')', cur.i):
+                    append(expect_number(cur))
+                    skip_space(cur)
+                expect_string(')', cur)
+                tag = make_tag(type_name, values, list_type=type_name_to_id(list_type_name))
+        else:
+            raise NotImplementedError(type_name)
+
+        # Add the tag to the compound or list that it is in, closing any compounds and lists that have ended
+        while True:
+            if tag is not None:
+                if not stack:
+                    return tag
+                frame = stack[-1]
+                if frame[1] is None:
+                    frame[0][frame[2]] = tag
+                    expect_string(')', cur)
+                else:
+                    frame[0].append(tag)
+                skip_space(cur)
+            frame = stack[-1]
+            if cur.i < text_len and not starts_with(')', cur.i):
+                break
+            expect_string(')', cur)
+            stack.pop()
+            if frame[1] is None:
+                tag = make_tag('compound', frame[0])
+            else:
+                tag = make_tag('list', frame[0], list_type=type_name_to_id(frame[1]))
+
+        # Start on the next entry of the compound or the next item of the list
+        if frame[1] is None:
+            expect_string('(', cur)
+            skip_space(cur)
+            type_name = expect_type_name('', cur)
+            skip_space(cur)
+            frame[2] = expect_quoted_string(cur)
+            skip_space(cur)
+        else:
+            type_name = frame[1]
     
 def make_tag(type_name: str, data, list_type = None) -> nbtformat.TagPayload:
-    if type_name == 'byte': return nbtformat.TagByte(data)
-    if type_name == 'short': return nbtformat.TagShort(data)
-    if type_name == 'int': return nbtformat.TagInt(data)
-    if type_name == 'long': return nbtformat.TagLong(data)
-    if type_name == 'float': return nbtformat.TagFloat(data)
-    if type_name == 'double': return nbtformat.TagDouble(data)
-    if type_name == 'string': return nbtformat.TagString(data)
-    if type_name == 'compound': return nbtformat.TagCompound(data)
     if type_name == 'list': return nbtformat.TagList(list_type, data)
-    raise NotImplementedError(type_name)
-
-def expect_int(sexpr: str) -> tuple[int, str]:
-    last_i = 0
-    for i, char in enumerate(sexpr):
-        if char not in '+-0123456789':
-            last_i = i
-            break
-    integer = int(sexpr[:last_i])
-    remaining = sexpr[last_i:]
-    return integer, remaining
-
-def expect_float(sexpr: str) -> tuple[float, str]:
-    last_i = 0
-    for i, char in enumerate(sexpr):
-        if char not in '.+-0123456789':
-            last_i = i
-            break
-    fp = float(sexpr[:last_i])
-    remaining = sexpr[last_i:]
-    return fp, remaining
-
-def expect_quoted_string(sexpr: str) -> tuple[str, str]:
-    _, sexpr = expect_string('"', sexpr)
-    last_i = 0
-    for i, c in enumerate(sexpr):
-        if c == '"':
-            last_i = i
-            break
-    name = sexpr[:last_i]
-    _, sexpr = expect_string('"', sexpr[last_i:])
-    return name, sexpr
-
-def skip_space(sexpr: str) -> str:
-    return sexpr.lstrip()
-
-def expect_string(expected_pre: str, given: str) -> tuple[str, str]:
-    if not given.startswith(expected_pre):
+    tag_class = _TAG_CLASSES.get(type_name)
+    if tag_class is None:
+        raise NotImplementedError(type_name)
+    return tag_class(data)
+
+def expect_int(cur: Cursor) -> int:
+    match = _INT_RE.match(cur.s, cur.i)
+    if not match:
+        raise ValueError("expected an integer")
+    cur.i = match.end()
+    return int(match.group())
+
+def expect_float(cur: Cursor) -> float:
+    match = _FLOAT_RE.match(cur.s, cur.i)
+    if not match:
+        raise ValueError("expected a floating point number")
+    cur.i = match.end()
+    return float(match.group())
+
+# Map each numeric type name to the function that parses its values
+_NUMBER_PARSERS = {
+    "byte": expect_int,
+    "short": expect_int,
+    "int": expect_int,
+    "long": expect_int,
+    "float": expect_float,
+    "double": expect_float,
+}
+
+def expect_quoted_string(cur: Cursor) -> str:
+    expect_string('"', cur)
+    last_i = cur.s.find('"', cur.i)
+    if last_i < 0:
+        raise ValueError("expected a closing '\"' for the quoted string")
+    value = cur.s[cur.i:last_i]
+    cur.i = last_i + 1
+    return value
+
+def skip_space(cur: Cursor) -> None:
+    cur.i = _SPACE_RE.match(cur.s, cur.i).end()
+
+def expect_string(expected_pre: str, cur: Cursor) -> str:
+    if not cur.s.startswith(expected_pre, cur.i):
         raise ValueError(f"expected input to start with '{expected_pre}'")
-    l = len(expected_pre)
-    return expected_pre, given[l:]
+    cur.i += len(expected_pre)
+    return expected_pre
 
-def expect_type_name(type_name: str, given: str) -> tuple[str, str]:
+def expect_type_name(type_name: str, cur: Cursor) -> str:
     if type_name:
-        return expect_string(type_name, given)
+        return expect_string(type_name, cur)
     else:
-        for tn in TYPE_NAMES:
-            if given.startswith(tn):
-                l = len(tn)
-                return tn, given[l:]
-        raise ValueError(f"expected string to start with any type name")
+        match = _TYPE_NAME_RE.match(cur.s, cur.i)
+        if not match:
+            raise ValueError(f"expected string to start with any type name")
+        cur.i = match.end()
+        return match.group()
         
 sexpr = '''
 (compound "root" (